@@ -0,0 +1,173 @@
+"""Render every dashboard page headlessly against the synthetic backend and report timings as JSON.
+
+    python benchmarks/page_benchmarks.py --rows 1000000 10000000 --warm-runs 5 --output bench.json
+
+Each data scale runs in its own subprocess with its own cache directories, so peak RSS and cold
+caches are per scale. For every page the first render is the cold run; ``--warm-runs`` further
+reruns measure the warm path. Exceptions raised by a page are listed on stderr and make the
+command exit non-zero, after the report has been written.
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = sorted(glob.glob(os.path.join(REPO_ROOT, "pages", "*.py")))
+
+
+# --- Figure Timing ----------------------------------------------------------------------------------------------
+def _patch_figures(figure_timings):
+    """Wrap the Plotly builders and st.plotly_chart so each figure reports build and render time."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import streamlit as st
+
+    build_seconds = defaultdict(float)
+
+    def timed_builder(builder):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            fig = builder(*args, **kwargs)
+            build_seconds[id(fig)] += time.perf_counter() - started
+            return fig
+        return wrapper
+
+    def timed_method(method):
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                build_seconds[id(self)] += time.perf_counter() - started
+        return wrapper
+
+    for name in ("bar", "pie", "line", "scatter", "area"):
+        setattr(px, name, timed_builder(getattr(px, name)))
+    for name in ("add_trace", "add_bar", "update_layout", "update_traces"):
+        setattr(go.Figure, name, timed_method(getattr(go.Figure, name)))
+
+    plotly_chart = st.plotly_chart
+
+    def timed_plotly_chart(fig, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return plotly_chart(fig, *args, **kwargs)
+        finally:
+            figure_timings.append({
+                "title": fig.layout.title.text,
+                "build_ms": build_seconds.pop(id(fig), 0.0) * 1000,
+                "render_ms": (time.perf_counter() - started) * 1000,
+            })
+
+    st.plotly_chart = timed_plotly_chart
+
+
+def _summarize_loaders(timings):
+    by_loader = defaultdict(list)
+    for entry in timings:
+        if entry["kind"] != "loader":
+            continue
+        by_loader[entry["name"]].append(entry["wall_ms"])
+    return {name: round(sum(walls), 3) for name, walls in by_loader.items()}
+
+
+# --- Worker: one data scale -------------------------------------------------------------------------------------
+def run_worker(rows, warm_runs, timeout):
+    sys.path.insert(0, REPO_ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    from utils import instrumentation
+    from utils.synthetic import get_synthetic_replica
+
+    started = time.perf_counter()
+    get_synthetic_replica()
+    result = {"rows": rows, "generate_s": round(time.perf_counter() - started, 3), "pages": {}}
+
+    figure_timings = []
+    _patch_figures(figure_timings)
+
+    for page in PAGES:
+        app = AppTest.from_file(page, default_timeout=timeout)
+        runs = []
+        for run in range(1 + warm_runs):
+            instrumentation.clear_spans()
+            figure_timings.clear()
+            started = time.perf_counter()
+            app.run()
+            runs.append({
+                "render_ms": round((time.perf_counter() - started) * 1000, 3),
+                "loaders_ms": _summarize_loaders(instrumentation.recent_spans()),
+                "figures": [{k: round(v, 3) if isinstance(v, float) else v for k, v in f.items()} for f in figure_timings],
+                "exceptions": [e.value for e in app.exception],
+            })
+        warm = runs[1:]
+        result["pages"][os.path.basename(page)] = {
+            "cold": runs[0],
+            "warm_render_ms_median": round(statistics.median(r["render_ms"] for r in warm), 3) if warm else None,
+            "warm": warm,
+        }
+    # ru_maxrss is the high-water mark of the whole worker, so it is only meaningful per scale
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def _page_exceptions(report):
+    for scale in report["scales"]:
+        for page, timings in scale["pages"].items():
+            for index, run in enumerate([timings["cold"], *timings["warm"]]):
+                for exception in run["exceptions"]:
+                    yield scale["rows"], page, "cold" if index == 0 else f"warm {index}", exception
+
+
+# --- Driver -----------------------------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="fact_staking rows per scale")
+    parser.add_argument("--warm-runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args.rows[0], args.warm_runs, args.timeout), sys.stdout)
+        return
+
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0], "scales": []}
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory(prefix="axelar-bench-") as scratch:
+            env = dict(
+                os.environ, AXELAR_BACKEND="synthetic", AXELAR_SYNTHETIC_ROWS=str(rows), PYTHONPATH=REPO_ROOT,
+                AXELAR_CACHE_DIR=os.path.join(scratch, "queries"), AXELAR_STATE_DIR=os.path.join(scratch, "state"),
+            )
+            completed = subprocess.run(
+                [sys.executable, __file__, "--worker", "--rows", str(rows),
+                 "--warm-runs", str(args.warm_runs), "--timeout", str(args.timeout)],
+                env=env, capture_output=True, text=True, check=True,
+            )
+        report["scales"].append(json.loads(completed.stdout))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    failures = list(_page_exceptions(report))
+    for rows, page, run, exception in failures:
+        print(f"page exception ({rows:,} rows, {page}, {run} run): {exception}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Tests run offline against the synthetic backend; set before any utils module reads them.
+os.environ.setdefault("AXELAR_BACKEND", "synthetic")
+os.environ.setdefault("AXELAR_SYNTHETIC_ROWS", "20000")
+os.environ.setdefault("AXELAR_PREWARM", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from utils.axelarscan import AxelarscanClient, serve_stub
+
+
+@pytest.fixture
+def stub():
+    server = serve_stub(total_supply=1_000_000_000, price=0.5)
+    yield server
+    server.shutdown()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_cold_timeout_returns_no_value_and_retries_in_background(stub):
+    stub.delay = 1.0
+    client = AxelarscanClient(stub.base_url, ttl=60, timeout=0.2)
+
+    started = time.monotonic()
+    assert client.supply_and_price() is None
+    assert time.monotonic() - started < 1.0
+
+    # Later reads do not block on the upstream again while the retry runs
+    started = time.monotonic()
+    assert client.supply_and_price() is None
+    assert time.monotonic() - started < 0.1
+
+    stub.delay = 0.0
+    assert wait_for(lambda: client.supply_and_price() == (1000.0, 0.5))
+
+
+def test_stale_value_served_during_background_refresh(stub):
+    client = AxelarscanClient(stub.base_url, ttl=0.1, timeout=2)
+    assert client.supply_and_price() == (1000.0, 0.5)
+
+    stub.price, stub.delay = 0.75, 0.5
+    time.sleep(0.15)
+    started = time.monotonic()
+    assert client.supply_and_price() == (1000.0, 0.5)
+    assert time.monotonic() - started < 0.1
+
+    assert wait_for(lambda: client.supply_and_price() == (1000.0, 0.75))
+
+
+def test_stale_value_kept_after_failed_refresh(stub):
+    client = AxelarscanClient(stub.base_url, ttl=0.1, timeout=0.2)
+    assert client.supply_and_price() == (1000.0, 0.5)
+
+    stub.price, stub.delay = 0.75, 1.0
+    time.sleep(0.15)
+    assert client.supply_and_price() == (1000.0, 0.5)
+    assert wait_for(lambda: not client._refreshing)
+    assert client.supply_and_price() == (1000.0, 0.5)
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from utils import cache as cache_module
+from utils.cache import DiskCache, MemoryCache, cached_loader
+
+
+def test_disk_cache_treats_unreadable_files_as_misses(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    (tmp_path / "garbage.parquet").write_text("not parquet")
+    pd.DataFrame({"a": [1]}).to_parquet(tmp_path / "foreign.parquet")
+
+    assert cache.get("garbage") is None
+    assert cache.get("foreign") is None
+    assert cache.get("missing") is None
+
+
+def test_disk_cache_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("key", pd.DataFrame({"a": [1, 2]}), ttl=60)
+
+    df, _ = cache.get("key")
+    assert df["a"].tolist() == [1, 2]
+
+
+def test_cached_loader_pins_per_call(monkeypatch):
+    memory_cache = MemoryCache()
+    monkeypatch.setattr(cache_module, "get_memory_cache", lambda: memory_cache)
+
+    @cached_loader(ttl=60, prewarm=False, pin=lambda days: days > 30)
+    def load_window(days):
+        return pd.DataFrame({"days": [days]})
+
+    load_window(7)
+    load_window(365)
+    assert sorted(entry["pinned"] for entry in memory_cache._entries.values()) == [False, True]
+
+
+def test_memory_cache_skips_entries_too_large_for_the_budget():
+    memory_cache = MemoryCache(max_bytes=10_000)
+    for i in range(5):
+        memory_cache.put(f"small-{i}", b"x" * 1_000, ttl=60, dataset="small", size=1_000)
+    memory_cache.put("huge", b"x" * 40_000, ttl=60, dataset="huge", size=40_000)
+
+    stats = memory_cache.stats()
+    assert (stats["entries"], stats["evictions"], stats["oversized"]) == (5, 0, 1)
+    assert memory_cache.get("huge", "huge") == (False, None)
+
+
+def test_resident_state_does_not_evict_cached_entries():
+    memory_cache = MemoryCache(max_bytes=10_000)
+    memory_cache.put("small", b"x", ttl=60, dataset="small", size=1_000)
+    memory_cache.set_resident("first_seen", 1_000_000)
+
+    stats = memory_cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["resident_bytes"]) == (1, 1_000, 1_000_000)
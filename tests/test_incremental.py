@@ -0,0 +1,167 @@
+import pandas as pd
+import pytest
+
+from utils import backends, incremental
+from utils.backends import get_backend
+from utils.incremental import EPOCH, EventIntervals, FirstSeenIndex, IncrementalFrame, RunningTotal
+
+TOTAL_QUERY = """
+    SELECT SUM(amount) AS net_amount, MAX(block_timestamp) AS last_block_timestamp
+    FROM axelar.gov.fact_staking
+    WHERE tx_succeeded = TRUE AND block_timestamp > %(watermark)s
+"""
+
+DAILY_QUERY = """
+    SELECT block_timestamp::date AS "Day", action AS "Action", COUNT(*) AS "Txns", SUM(amount) AS "Amount"
+    FROM axelar.gov.fact_staking
+    WHERE tx_succeeded = TRUE AND block_timestamp >= %(since)s
+    GROUP BY 1, 2
+"""
+
+FIRST_SEEN_QUERY = """
+    SELECT delegator_address AS key, date_trunc('month', block_timestamp) AS month,
+           MAX(block_timestamp) AS last_block_timestamp
+    FROM axelar.gov.fact_staking
+    WHERE tx_succeeded = TRUE AND block_timestamp > %(watermark)s
+    GROUP BY 1, 2
+"""
+
+CLAIM_TOTALS_QUERY = """
+    SELECT COUNT(*) AS claims, SUM(amount) AS amount, MAX(block_timestamp) AS last_block_timestamp
+    FROM axelar.gov.fact_staking_rewards
+    WHERE tx_succeeded = TRUE AND block_timestamp > %(watermark)s
+"""
+
+CLAIM_EVENTS_QUERY = """
+    SELECT delegator_address AS key, block_timestamp::date AS day, COUNT(*) AS events
+    FROM axelar.gov.fact_staking_rewards
+    WHERE tx_succeeded = TRUE AND block_timestamp > %(watermark)s AND block_timestamp <= %(until)s
+    GROUP BY 1, 2
+    ORDER BY day
+"""
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    # The in-memory synthetic backend is normally never persisted; these tests opt it in.
+    monkeypatch.setattr(incremental, "STATE_DIR", str(tmp_path))
+    monkeypatch.setattr(backends, "is_ephemeral", lambda name=None: False)
+    return tmp_path
+
+
+@pytest.fixture
+def append_rows():
+    """Append rows after the latest ones: an existing and a new delegator, later today and next month."""
+    replica = get_backend()
+
+    def append():
+        cursor = replica.cursor()
+        try:
+            for table in ("fact_staking", "fact_staking_rewards"):
+                cursor.execute(f"""
+                    INSERT INTO axelar.gov.{table} BY NAME
+                    WITH latest AS (
+                        SELECT max(block_timestamp) AS ts, min(delegator_address) AS known, min(validator_address) AS validator
+                        FROM axelar.gov.{table}
+                    )
+                    SELECT
+                        ts + offset_ AS block_timestamp,
+                        'test-' || md5(random()::VARCHAR) AS tx_id,
+                        TRUE AS tx_succeeded,
+                        {"'delegate' AS action," if table == "fact_staking" else ""}
+                        1000000 AS amount,
+                        delegator AS delegator_address,
+                        validator AS validator_address
+                    FROM latest,
+                        (VALUES (INTERVAL 1 HOUR), (INTERVAL 2 HOUR), (INTERVAL 35 DAY)) o(offset_),
+                        (VALUES (known), ('axelar1testdelegator')) d(delegator)
+                """)
+        finally:
+            cursor.close()
+
+    yield append
+    cursor = replica.cursor()
+    try:
+        for table in ("fact_staking", "fact_staking_rewards"):
+            cursor.execute(f"DELETE FROM axelar.gov.{table} WHERE tx_id LIKE 'test-%'")
+    finally:
+        cursor.close()
+
+
+def sorted_frame(df):
+    return df.sort_values(list(df.columns[:2])).reset_index(drop=True)
+
+
+def test_running_total(state_dir, append_rows):
+    total = RunningTotal(TOTAL_QUERY, "total", refresh_interval=0)
+    before = total.value()
+    append_rows()
+    after = total.value()
+    assert after == pytest.approx(before + 6 * 1_000_000)
+
+    reloaded = RunningTotal(TOTAL_QUERY, "total", refresh_interval=0)
+    assert (reloaded.total, reloaded.watermark) == (after, total.watermark)
+    assert total.rebuild() == pytest.approx(after)
+
+    changed = RunningTotal(TOTAL_QUERY.replace("TRUE", "FALSE"), "total")
+    assert (changed.total, changed.watermark) == (0.0, EPOCH)
+
+
+def test_incremental_frame(state_dir, append_rows):
+    daily = IncrementalFrame(DAILY_QUERY, "daily", "Day", refresh_interval=0)
+    daily.frame()
+    append_rows()
+    incremental_frame = daily.frame().copy()
+
+    reloaded = IncrementalFrame(DAILY_QUERY, "daily", "Day", refresh_interval=0)
+    pd.testing.assert_frame_equal(sorted_frame(reloaded._frame), sorted_frame(incremental_frame))
+    pd.testing.assert_frame_equal(sorted_frame(daily.rebuild()), sorted_frame(incremental_frame))
+
+    changed = IncrementalFrame(DAILY_QUERY.replace("TRUE", "FALSE"), "daily", "Day")
+    assert changed._frame is None
+
+
+def test_first_seen_index(state_dir, append_rows):
+    index = FirstSeenIndex(FIRST_SEEN_QUERY, "first_seen", refresh_interval=0)
+    months_before = len(index.monthly_counts())
+    append_rows()
+    counts = index.monthly_counts()
+    assert len(counts) == months_before + 1
+    assert counts.iloc[-1][["New", "Returning"]].tolist() == [0, 2]  # both were active earlier this month
+    *_, (delta, _) = incremental.load_state_log(index._path, FIRST_SEEN_QUERY)
+    assert len(delta) == 2  # the last part holds only the two keys this update changed
+
+    reloaded = FirstSeenIndex(FIRST_SEEN_QUERY, "first_seen", refresh_interval=0)
+    assert reloaded.watermark == index.watermark
+    pd.testing.assert_frame_equal(reloaded.monthly_counts(), counts)
+
+    keys = get_backend().query("SELECT DISTINCT delegator_address AS key FROM axelar.gov.fact_staking LIMIT 50")["KEY"]
+    first_months = [index.first_month(key) for key in keys]
+    index.rebuild()
+    pd.testing.assert_frame_equal(index.monthly_counts(), counts)
+    assert len(incremental.load_state_log(index._path, FIRST_SEEN_QUERY)) == 1  # rebuilt into one part
+    assert [index.first_month(key) for key in keys] == first_months
+    assert [reloaded.first_month(key) for key in keys] == first_months
+
+    changed = FirstSeenIndex(FIRST_SEEN_QUERY.replace("TRUE", "FALSE"), "first_seen")
+    assert changed.watermark == EPOCH
+
+
+def test_event_intervals(state_dir, append_rows):
+    intervals = EventIntervals(CLAIM_TOTALS_QUERY, CLAIM_EVENTS_QUERY, "claims", refresh_interval=0)
+    keys_before, totals_before, _ = intervals.snapshot()
+    append_rows()
+    snapshot = intervals.snapshot()
+    assert snapshot[0] == keys_before + 1
+    assert snapshot[1]["CLAIMS"] == totals_before["CLAIMS"] + 6
+    *_, (delta, _) = incremental.load_state_log(intervals._path, intervals._queries)
+    assert len(delta) == 2  # the last part holds only the two keys this update touched
+
+    reloaded = EventIntervals(CLAIM_TOTALS_QUERY, CLAIM_EVENTS_QUERY, "claims", refresh_interval=0)
+    assert reloaded.watermark == intervals.watermark
+    assert reloaded.snapshot() == snapshot
+    intervals.rebuild()
+    assert intervals.snapshot() == snapshot
+
+    changed = EventIntervals(CLAIM_TOTALS_QUERY.replace("TRUE", "FALSE"), CLAIM_EVENTS_QUERY, "claims")
+    assert changed.watermark == EPOCH
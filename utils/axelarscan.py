@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests
+import streamlit as st
+
+from utils.backends import BACKEND
+from utils.instrumentation import record_cache_miss, span
+
+# --- Client Settings --------------------------------------------------------------------------------------------
+AXELARSCAN_API = os.environ.get("AXELARSCAN_API", "https://api.axelarscan.io/api")
+CACHE_TTL = 300        # seconds a supply/price pair is considered fresh
+TIMEOUT = (3.05, 5)    # (connect, read) seconds for every upstream call
+FETCH_ERRORS = (requests.RequestException, ValueError, KeyError)
+
+
+class AxelarscanClient:
+    """Keep-alive Axelarscan client with a stale-while-revalidate cache for supply and price.
+
+    The first call blocks on the upstream API; afterwards callers always get the last good value
+    immediately and an expired entry is refreshed on a background thread. If that first call
+    fails there is no value yet: callers get None and the fetch is retried in the background.
+    """
+
+    def __init__(self, base_url=AXELARSCAN_API, ttl=CACHE_TTL, timeout=TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._fetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="axelarscan")
+        self._lock = threading.Lock()
+        self._cached = None  # (value, fetched_at)
+        self._refreshing = False
+        self._cold_failed = False
+
+    def _get_json(self, endpoint, params=None):
+        with span(f"axelarscan:{endpoint}", kind="http"):
+            response = self._session.get(f"{self.base_url}/{endpoint}", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+    def _fetch(self):
+        supply = self._fetch_pool.submit(self._get_json, "getTotalSupply")
+        price = self._fetch_pool.submit(self._get_json, "getTokensPrice", {"symbol": "AXL"})
+        return float(supply.result()) / 1e6, price.result()["AXL"]["price"]
+
+    def _store(self, value):
+        with self._lock:
+            self._cached = (value, time.monotonic())
+        return value
+
+    def _refresh(self):
+        try:
+            self._store(self._fetch())
+        except FETCH_ERRORS:
+            pass  # keep serving the stale value (or None), the next expired read retries
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def supply_and_price(self):
+        """Return ``(total_supply_in_millions, axl_price_usd)``, or None while no value has been fetched."""
+        with self._lock:
+            cached = self._cached
+            blocking = cached is None and not self._cold_failed
+            expired = cached is None or time.monotonic() - cached[1] >= self.ttl
+            if expired and not blocking and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh, name="axelarscan-refresh", daemon=True).start()
+        if not blocking:
+            return cached[0] if cached is not None else None
+        record_cache_miss()
+        try:
+            return self._store(self._fetch())
+        except FETCH_ERRORS:
+            with self._lock:
+                self._cold_failed = True
+            return None
+
+
+@st.cache_resource
+def get_axelarscan_client():
+    if BACKEND == "synthetic":
+        return AxelarscanClient(serve_stub().base_url)
+    return AxelarscanClient()
+
+
+# --- Local Stub Server ------------------------------------------------------------------------------------------
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        endpoint = urlparse(self.path).path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint == "getTotalSupply":
+            payload = self.server.total_supply
+        elif endpoint == "getTokensPrice":
+            payload = {"AXL": {"price": self.server.price}}
+        else:
+            self.send_error(404)
+            return
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_stub(total_supply=1_180_000_000, price=0.35, delay=0.0, port=0):
+    """Serve a local stand-in for the two Axelarscan endpoints on a background thread.
+
+    ``delay`` adds latency to every response so timeouts and stale reads can be exercised.
+    Point a client at ``server.base_url`` and call ``server.shutdown()`` when done.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+    server.total_supply = total_supply
+    server.price = price
+    server.delay = delay
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    threading.Thread(target=server.serve_forever, name="axelarscan-stub", daemon=True).start()
+    return server
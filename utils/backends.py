@@ -0,0 +1,58 @@
+import os
+
+from utils.db import fetch_snowflake, iter_snowflake_batches
+
+# --- Backend Selection ------------------------------------------------------------------------------------------
+# A backend is any object with ``query(query, params)`` returning a DataFrame and
+# ``iter_batches(query, params)`` yielding DataFrames, both taking the pages' Snowflake SQL.
+BACKEND = os.environ.get("AXELAR_BACKEND", "snowflake")
+
+
+class SnowflakeBackend:
+    def query(self, query, params=None):
+        return fetch_snowflake(query, params)
+
+    def iter_batches(self, query, params=None):
+        return iter_snowflake_batches(query, params)
+
+
+def _snowflake():
+    return SnowflakeBackend()
+
+
+def _replica():
+    from utils.replica import get_replica
+    return get_replica()
+
+
+def _synthetic():
+    from utils.synthetic import get_synthetic_replica
+    return get_synthetic_replica()
+
+
+BACKENDS = {
+    "snowflake": _snowflake,
+    "replica": _replica,
+    "synthetic": _synthetic,
+}
+
+
+def register_backend(name, factory):
+    BACKENDS[name] = factory
+
+
+def is_ephemeral(name=None):
+    """True when the backend's data is regenerated in every process (in-memory synthetic data)."""
+    if (name or BACKEND) != "synthetic":
+        return False
+    from utils.synthetic import SYNTHETIC_PATH
+    return SYNTHETIC_PATH == ":memory:"
+
+
+def get_backend(name=None):
+    name = name or BACKEND
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown AXELAR_BACKEND {name!r}, expected one of {sorted(BACKENDS)}") from None
+    return factory()
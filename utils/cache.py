@@ -0,0 +1,327 @@
+import functools
+import hashlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.frames import normalize_result
+from utils.instrumentation import instrumented, record_cache_source
+
+# --- Cache Settings ---------------------------------------------------------------------------------------------
+CACHE_DIR = os.environ.get("AXELAR_CACHE_DIR", ".cache/queries")
+CACHE_MAX_BYTES = int(float(os.environ.get("AXELAR_CACHE_MAX_MB", "512")) * 1024 * 1024)
+MEMORY_CACHE_MAX_BYTES = int(float(os.environ.get("AXELAR_MEMORY_CACHE_MB", "256")) * 1024 * 1024)
+MEMORY_CACHE_MAX_ENTRY_FRACTION = 0.25  # larger results are served uncached instead of flushing the rest
+ESTIMATE_SAMPLE_ITEMS = 1000
+
+_local = threading.local()
+
+
+def normalize_sql(query):
+    return " ".join(query.split())
+
+
+def cache_key(backend, query, params=None):
+    payload = json.dumps([backend, normalize_sql(query), params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# --- Persistent Result Cache ------------------------------------------------------------------------------------
+class DiskCache:
+    """Query results stored as Parquet files that survive restarts.
+
+    Each entry carries its own TTL in the file's metadata. Writes go through a temp file and an
+    atomic rename; once the directory outgrows ``max_bytes`` the least recently read files go first.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    def get(self, key):
+        """Return ``(df, created_at)`` for a live entry, or None if it is missing or expired."""
+        import pyarrow.parquet as pq
+
+        path = self._path(key)
+        try:
+            table = pq.read_table(path)
+            meta = json.loads(table.schema.metadata[b"axelar_cache"])
+            if meta["ttl"] is not None and time.time() - meta["created"] > meta["ttl"]:
+                return None
+            df = table.to_pandas()
+        except (OSError, KeyError, TypeError, ValueError):
+            # Missing, half-evicted, unreadable or foreign files (ArrowInvalid is a ValueError) are misses.
+            return None
+        try:
+            os.utime(path)  # mtime doubles as last-access time for eviction
+        except FileNotFoundError:
+            pass  # evicted since the read; the frame is still good
+        return df, meta["created"]
+
+    def put(self, key, df, ttl):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"axelar_cache"] = json.dumps({"created": time.time(), "ttl": ttl}).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".parquet"):
+                    try:
+                        stat = os.stat(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        continue  # removed by another process since the listing
+                    entries.append((stat.st_mtime, stat.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+@st.cache_resource
+def get_disk_cache():
+    return DiskCache()
+
+
+# --- In-Memory Loader Cache ------------------------------------------------------------------------------------
+def estimate_bytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (np.ndarray, pd.Index)):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_bytes(item) for item in value)
+    if isinstance(value, dict):
+        # Incremental indexes hold one small entry per delegator, so a sample sizes them closely enough.
+        sample = list(itertools.islice(value.items(), ESTIMATE_SAMPLE_ITEMS))
+        per_item = sum(estimate_bytes(key) + estimate_bytes(item) for key, item in sample) / max(len(sample), 1)
+        return sys.getsizeof(value) + int(per_item * len(value))
+    return sys.getsizeof(value)
+
+
+CACHE_OUTCOMES = ("hits", "misses", "evictions", "expirations", "oversized")
+
+
+class MemoryCache:
+    """Process-wide loader results under one byte budget, shared by every session and page.
+
+    Entries expire after their TTL and, once the budget is exceeded, the least recently used
+    unpinned ones are evicted first. Pinned entries (small, hot KPI datasets) only ever expire.
+    A result larger than ``MEMORY_CACHE_MAX_ENTRY_FRACTION`` of the budget is not stored at all.
+    Long-lived state held elsewhere (the incremental frames and indexes in ``utils.incremental``)
+    reports its size through ``set_resident``; it is shown alongside the cache but cannot be
+    evicted, so it is kept out of the budget.
+    """
+
+    def __init__(self, max_bytes=MEMORY_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._resident = {}  # dataset -> bytes of state kept outside the cache
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._stats = dict.fromkeys(CACHE_OUTCOMES, 0)
+        self._datasets = {}
+
+    def _count(self, dataset, outcome):
+        self._stats[outcome] += 1
+        per_dataset = self._datasets.setdefault(dataset, dict.fromkeys(CACHE_OUTCOMES, 0))
+        per_dataset[outcome] += 1
+
+    def _drop(self, key, outcome):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["bytes"]
+        self._count(entry["dataset"], outcome)
+
+    def get(self, key, dataset):
+        """Return ``(True, value)`` for a live entry, else ``(False, None)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() >= entry["expires"]:
+                self._drop(key, "expirations")
+                entry = None
+            if entry is None:
+                self._count(dataset, "misses")
+                return False, None
+            self._entries.move_to_end(key)
+            self._count(dataset, "hits")
+            return True, entry["value"]
+
+    def put(self, key, value, ttl, dataset, pinned=False, size=None):
+        """Store ``value``; pass ``size`` when the caller has already measured it."""
+        size = estimate_bytes(value) if size is None else size
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)["bytes"]
+            if size > self.max_bytes * MEMORY_CACHE_MAX_ENTRY_FRACTION:
+                self._count(dataset, "oversized")
+                return
+            self._entries[key] = {
+                "value": value, "bytes": size, "expires": now + ttl, "dataset": dataset, "pinned": pinned,
+            }
+            self._bytes += size
+            for old_key in [k for k, e in self._entries.items() if now >= e["expires"]]:
+                self._drop(old_key, "expirations")
+            self._evict()
+
+    def set_resident(self, dataset, size):
+        """Report ``size`` bytes of state held outside the cache for ``dataset``; it is not part of the budget."""
+        with self._lock:
+            self._resident[dataset] = size
+            self._datasets.setdefault(dataset, dict.fromkeys(CACHE_OUTCOMES, 0))
+
+    def _evict(self):
+        for old_key in [k for k, e in self._entries.items() if not e["pinned"]]:
+            if self._bytes <= self.max_bytes:
+                break
+            self._drop(old_key, "evictions")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            pinned = sum(e["bytes"] for e in self._entries.values() if e["pinned"])
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "pinned_bytes": pinned,
+                "resident_bytes": sum(self._resident.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    def dataset_stats(self):
+        """Per-dataset entries, bytes and hit/miss/eviction counts, largest first."""
+        with self._lock:
+            rows = {
+                name: {"dataset": name, "entries": 0, "bytes": 0, "resident": False, **counts}
+                for name, counts in self._datasets.items()
+            }
+            for entry in self._entries.values():
+                row = rows[entry["dataset"]]
+                row["entries"] += 1
+                row["bytes"] += entry["bytes"]
+                row["pinned"] = row.get("pinned", False) or entry["pinned"]
+            for name, size in self._resident.items():
+                rows[name].update(bytes=rows[name]["bytes"] + size, pinned=True, resident=True)
+        columns = ["dataset", "entries", "bytes", "pinned", "resident", *CACHE_OUTCOMES]
+        return pd.DataFrame(list(rows.values()), columns=columns).sort_values("bytes", ascending=False)
+
+
+@st.cache_resource
+def get_memory_cache():
+    return MemoryCache()
+
+
+def _detached(value):
+    # Callers get their own DataFrame object, so reassigning its columns or index never reaches
+    # the cached one; render code must still not write into values in place.
+    return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+
+# --- Cached Loaders ---------------------------------------------------------------------------------------------
+def current_query_ttl():
+    """TTL of the cached loader running on this thread, or None outside one."""
+    return getattr(_local, "ttl", None)
+
+
+def current_dataset():
+    return getattr(_local, "dataset", None)
+
+
+def cached_loader(ttl, prewarm=True, pin=False):
+    """Cache a ``load_*`` function in memory and every query it runs on disk, both for ``ttl`` seconds.
+
+    Results live in the shared ``MemoryCache``; ``pin=True`` exempts them from budget eviction.
+    DataFrame results are compacted by ``utils.frames.normalize_frame`` before they are cached.
+
+    Queries issued outside a cached loader (e.g. incremental deltas) never touch the disk cache.
+    Pass ``prewarm=False`` for loaders keyed by user input (search terms, pages) so each
+    combination someone looked at once is not kept refreshed in the background. ``prewarm`` and
+    ``pin`` may also be predicates over the loader's arguments, e.g. ``is_full_range`` from
+    ``utils.daterange`` to keep only the default date range warm and pinned.
+    """
+
+    def decorator(loader):
+        dataset = loader.__name__
+        # Pages are all run as __main__, so the defining file tells same-named loaders apart.
+        identity = f"{loader.__code__.co_filename}:{loader.__qualname__}"
+
+        def with_query_ttl(keep_warm, *args, **kwargs):
+            previous = current_query_ttl(), current_dataset(), getattr(_local, "prewarm", True)
+            _local.ttl, _local.dataset, _local.prewarm = ttl, loader.__name__, keep_warm
+            try:
+                return normalize_result(loader.__name__, loader(*args, **kwargs))
+            finally:
+                _local.ttl, _local.dataset, _local.prewarm = previous
+
+        @functools.wraps(loader)
+        def cached(*args, **kwargs):
+            memory_cache = get_memory_cache()
+            key = cache_key("loader", identity, [args, kwargs])
+            found, value = memory_cache.get(key, dataset)
+            if not found:
+                keep_warm, pinned = (option(*args, **kwargs) if callable(option) else option for option in (prewarm, pin))
+                value, size = with_query_ttl(keep_warm, *args, **kwargs)
+                memory_cache.put(key, value, ttl, dataset, pinned=pinned, size=size)
+            return _detached(value)
+
+        return instrumented(cached)
+
+    return decorator
+
+
+def cached_query(backend, query, params, fetch):
+    """Serve ``query`` from the disk cache when a cached loader is running, else call ``fetch``.
+
+    Queries served this way are handed to the pre-warmer so they are refreshed before expiring.
+    """
+    ttl = current_query_ttl()
+    if ttl is None:
+        return fetch()
+    from utils.prewarm import get_prewarmer
+
+    disk_cache = get_disk_cache()
+    key = cache_key(backend, query, params)
+    cached = disk_cache.get(key)
+    if cached is not None:
+        df, refreshed_at = cached
+        record_cache_source("disk")
+    else:
+        df, refreshed_at = fetch(), time.time()
+        disk_cache.put(key, df, ttl)
+    if getattr(_local, "prewarm", True):
+        get_prewarmer().track(key, current_dataset(), backend, query, params, ttl, refreshed_at)
+    return df
@@ -0,0 +1,45 @@
+from datetime import date, datetime, time, timedelta
+
+import pandas as pd
+import streamlit as st
+
+# --- Global Date Range ------------------------------------------------------------------------------------------
+# Loaders take the range as ``(start, end)`` datetimes, ``end`` exclusive, and bind them as
+# %(start)s / %(end)s against the raw column (``block_timestamp >= %(start)s AND block_timestamp
+# < %(end)s``, never a cast of it) so Snowflake can prune micro-partitions. Loaders built on
+# full-history cubes slice them with ``slice_range`` instead, so narrowing the range never
+# re-queries.
+DATA_START = date(2022, 2, 10)  # first day of staking history on Axelar mainnet
+
+
+def date_range_control():
+    """Sidebar date range shared by every page, returned as ``(start, end)`` with ``end`` exclusive."""
+    today = date.today()
+    # Widget state is dropped on page switches, so the last complete pick is kept separately.
+    saved = st.session_state.get("date_range_value", (DATA_START, today))
+    picked = st.sidebar.date_input(
+        "Date range", value=saved, min_value=DATA_START, max_value=today, key="date_range",
+        help="Applies to every chart and KPI; narrowing it is served from already loaded data where possible."
+    )
+    if len(picked) == 2:  # a range being picked has only its start until the second click
+        saved = st.session_state["date_range_value"] = tuple(picked)
+    start, end = saved
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+
+def is_open_ended(end):
+    """True when a range runs through today, as the picker's default does."""
+    return end.date() > date.today()
+
+
+def is_full_range(start, end):
+    return start.date() <= DATA_START and is_open_ended(end)
+
+
+def month_floor(moment):
+    return pd.Timestamp(moment).to_period("M").start_time
+
+
+def slice_range(df, column, start, end):
+    values = df[column]
+    return df[(values >= start) & (values < end)]
@@ -0,0 +1,70 @@
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from utils.db import POOL_SIZE, get_pool
+
+logger = logging.getLogger(__name__)
+
+
+# --- Shared Loader Executor -------------------------------------------------------------------------------------
+# One worker per pooled connection, so every loader of a page gets its own connection and
+# concurrent sessions queue on the pool instead of opening more warehouse sessions. The pool may
+# be resized through st.secrets, so it is asked for its size; offline backends use the default.
+def _worker_count():
+    from utils.backends import BACKEND
+
+    return get_pool().size if BACKEND == "snowflake" else POOL_SIZE
+
+
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=_worker_count(), thread_name_prefix="page-loader")
+
+
+def _call_with_ctx(ctx, loader):
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, ctx)
+    try:
+        return loader()
+    finally:
+        add_script_run_ctx(thread, None)
+
+
+def run_page(sections):
+    """Run every loader of a page concurrently and render each section as soon as its data is ready.
+
+    ``sections`` is a list of ``(placeholder, loaders, render)`` tuples: ``placeholder`` is a container
+    created in layout order, ``loaders`` a tuple of zero-argument callables and ``render`` a callable
+    that receives one result per loader. Loaders shared by several sections only run once. A
+    section whose loader or render fails shows the error in its own placeholder; the others still
+    render.
+    """
+    ctx = get_script_run_ctx()
+    executor = get_executor()
+
+    futures = {}
+    for _, loaders, _ in sections:
+        for loader in loaders:
+            if loader not in futures:
+                futures[loader] = executor.submit(_call_with_ctx, ctx, loader)
+
+    pending = list(sections)
+    while pending:
+        ready = [s for s in pending if all(futures[loader].done() for loader in s[1])]
+        if not ready:
+            waiting = {futures[loader] for s in pending for loader in s[1] if not futures[loader].done()}
+            wait(waiting, return_when=FIRST_COMPLETED)
+            continue
+        for section in ready:
+            placeholder, loaders, render = section
+            with placeholder:
+                try:
+                    render(*[futures[loader].result() for loader in loaders])
+                except Exception as exc:
+                    logger.exception("page section failed")
+                    st.error(f"This section could not be loaded ({type(exc).__name__}: {exc}).")
+            pending.remove(section)
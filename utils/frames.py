@@ -0,0 +1,79 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Loader Result Normalization --------------------------------------------------------------------------------
+# Cached loader results are pickled into the cache and copied out again on every rerun, so they
+# are compacted once when produced. Integers are not narrowed below int32 so running sums and
+# counts computed from them downstream cannot overflow.
+CATEGORY_MAX_RATIO = 0.5  # a text column becomes categorical when at most half its values are distinct
+
+_sizes = {}
+_lock = threading.Lock()
+
+
+def _float32_is_lossless(values):
+    narrowed = values.astype("float32")
+    with np.errstate(over="ignore", invalid="ignore"):
+        return bool(np.array_equal(narrowed.astype("float64"), values, equal_nan=True))
+
+
+def normalize_frame(df):
+    """Smallest lossless dtypes for ``df``: int32 where it fits, float32 where exact, categorical labels."""
+    columns = {}
+    for name, column in df.items():
+        dtype = column.dtype
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype) and dtype.itemsize > 4:
+            if column.empty or (column.min() >= np.iinfo("int32").min and column.max() <= np.iinfo("int32").max):
+                columns[name] = column.astype("int32")
+        elif pd.api.types.is_float_dtype(dtype) and dtype.itemsize > 4:
+            if _float32_is_lossless(column.to_numpy()):
+                columns[name] = column.astype("float32")
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            if len(column) > 1 and column.nunique() <= len(column) * CATEGORY_MAX_RATIO:
+                columns[name] = column.astype("category")
+    return df.assign(**columns) if columns else df
+
+
+def record_dataset_size(name, raw_bytes, stored_bytes, rows):
+    with _lock:
+        _sizes[name] = {
+            "dataset": name,
+            "rows": rows,
+            "raw_kb": raw_bytes / 1024,
+            "stored_kb": stored_bytes / 1024,
+            "saved_pct": 100 * (1 - stored_bytes / raw_bytes) if raw_bytes else 0.0,
+            "measured": time.time(),
+        }
+
+
+def dataset_sizes():
+    """Bytes per cached dataset before and after normalization, largest first."""
+    with _lock:
+        rows = list(_sizes.values())
+    columns = ["dataset", "rows", "raw_kb", "stored_kb", "saved_pct"]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame(rows)[columns].sort_values("stored_kb", ascending=False)
+
+
+def normalize_result(name, result):
+    """Normalize a DataFrame loader result and record its size; returns ``(result, stored_bytes)``.
+
+    Other results pass through with ``stored_bytes`` None. Each column is measured once: columns
+    normalization left alone weigh the same before and after, so text is only walked a single time.
+    """
+    if not isinstance(result, pd.DataFrame):
+        return result, None
+    normalized = normalize_frame(result)
+    raw_bytes = stored_bytes = int(result.index.memory_usage(deep=True))
+    for (_, column), (_, stored) in zip(result.items(), normalized.items()):
+        size = int(column.memory_usage(index=False, deep=True))
+        raw_bytes += size
+        stored_bytes += size if stored.dtype == column.dtype else int(stored.memory_usage(index=False, deep=True))
+    record_dataset_size(name, raw_bytes, stored_bytes, len(normalized))
+    return normalized, stored_bytes
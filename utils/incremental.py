@@ -0,0 +1,475 @@
+import json
+import numbers
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from utils.cache import estimate_bytes, get_memory_cache, normalize_sql
+from utils.db import iter_query_batches, run_query
+
+EPOCH = datetime(1970, 1, 1)
+STATE_DIR = os.environ.get("AXELAR_STATE_DIR", ".cache/state")
+STATE_LOG_MAX_PARTS = 64  # appended parts kept before a state log is compacted into one
+
+
+# --- Persisted State --------------------------------------------------------------------------------------------
+# Incremental state is written to Parquet under STATE_DIR after every update, so a restarted
+# server resumes from its watermark instead of rescanning history. Scalars travel in the file's
+# metadata together with the query they were computed by; a changed query discards the file.
+# Backends whose data does not outlive the process get no path and are never persisted.
+def state_path(name, part, suffix=".parquet"):
+    from utils.backends import BACKEND, is_ephemeral
+
+    if is_ephemeral():
+        return None
+    return os.path.join(STATE_DIR, f"{name}.{BACKEND}.{part}{suffix}")
+
+
+def save_state(path, frame, state, query):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path is None:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    meta = {"query": normalize_sql(query), **state}
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"axelar_state"] = json.dumps(meta, default=str).encode("utf-8")
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_state(path, query):
+    """``(frame, state)`` written by ``save_state`` for the same query, or None."""
+    import pyarrow.parquet as pq
+
+    if path is None:
+        return None
+    try:
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[b"axelar_state"])
+    except (FileNotFoundError, OSError, KeyError, TypeError, ValueError):
+        return None
+    if meta.pop("query", None) != normalize_sql(query):
+        return None
+    return table.to_pandas(), meta
+
+
+# State keyed by delegator grows with the chain, so it is kept as an append log instead: a
+# directory of numbered parts, each holding only the keys one update changed (later parts win)
+# plus the scalars as of that update. A compacting write replaces every earlier part.
+def _log_parts(path):
+    try:
+        names = sorted(name for name in os.listdir(path) if name.endswith(".parquet"))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(path, name) for name in names]
+
+
+def append_state(path, frame, state, query, compact=False):
+    """Write ``frame`` as the next part of the log at ``path`` and return how many parts it has."""
+    if path is None:
+        return 0
+    parts = _log_parts(path)
+    sequence = int(os.path.basename(parts[-1]).split(".")[0]) + 1 if parts else 1
+    save_state(os.path.join(path, f"{sequence:08d}.parquet"), frame, state, query)
+    if not compact:
+        return len(parts) + 1
+    for part in parts:
+        try:
+            os.remove(part)
+        except FileNotFoundError:
+            pass
+    return 1
+
+
+def load_state_log(path, query):
+    """Every ``(frame, state)`` part of the log at ``path``, oldest first, or None unless all match ``query``."""
+    parts = [load_state(part, query) for part in _log_parts(path)] if path else []
+    if not parts or None in parts:
+        return None
+    return parts
+
+
+def replay_state_log(parts, key_column):
+    """The latest row per ``key_column`` across ``parts`` and the state saved with the last part."""
+    frame = pd.concat([frame for frame, _ in parts], ignore_index=True)
+    return frame.drop_duplicates(key_column, keep="last"), parts[-1][1]
+
+
+def report_size(name, *state):
+    """Report the in-memory size of a state holder next to the shared memory cache's own usage."""
+    get_memory_cache().set_resident(name, sum(estimate_bytes(part) for part in state))
+
+
+class RunningTotal:
+    """Running sum over an append-only fact table, advanced from a ``block_timestamp`` watermark.
+
+    ``query`` must take a ``%(watermark)s`` parameter, only look at rows with
+    ``block_timestamp > %(watermark)s`` and return one row with ``NET_AMOUNT`` (the sum over those
+    rows) and ``LAST_BLOCK_TIMESTAMP`` (their max). The first read, and ``rebuild()``, start from
+    the epoch (or from the total saved under ``name``); every later refresh only folds in rows
+    newer than the watermark.
+    """
+
+    def __init__(self, query, name, refresh_interval=60):
+        self._query = query
+        self._path = state_path(name, "total")
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.total = 0.0
+        self.watermark = EPOCH
+        self._checked_at = None
+
+    def _load(self):
+        saved = load_state(self._path, self._query)
+        if saved is not None:
+            _, state = saved
+            self.total = state["total"]
+            self.watermark = datetime.fromisoformat(state["watermark"])
+
+    def _save(self):
+        state = {"total": self.total, "watermark": self.watermark.isoformat()}
+        save_state(self._path, pd.DataFrame(), state, self._query)
+
+    def _advance(self):
+        delta = run_query(self._query, {"watermark": self.watermark}, cache=False).iloc[0]
+        if pd.notna(delta["LAST_BLOCK_TIMESTAMP"]):
+            self.total += float(delta["NET_AMOUNT"])
+            self.watermark = pd.Timestamp(delta["LAST_BLOCK_TIMESTAMP"]).to_pydatetime()
+            self._save()
+        self._checked_at = time.monotonic()
+
+    def value(self):
+        with self._lock:
+            if self._checked_at is None or time.monotonic() - self._checked_at >= self._refresh_interval:
+                self._advance()
+            return self.total
+
+    def rebuild(self):
+        with self._lock:
+            self._reset()
+            self._advance()
+            return self.total
+
+
+def _concat_keeping_categories(closed, fresh):
+    closed, fresh = closed.copy(), fresh.copy()
+    for column in closed.columns:
+        if isinstance(closed[column].dtype, pd.CategoricalDtype) and isinstance(fresh[column].dtype, pd.CategoricalDtype):
+            categories = union_categoricals([closed[column], fresh[column]], ignore_order=True).categories
+            closed[column] = closed[column].cat.set_categories(categories)
+            fresh[column] = fresh[column].cat.set_categories(categories)
+    return pd.concat([closed, fresh], ignore_index=True)
+
+
+class IncrementalFrame:
+    """Time-bucketed result where closed periods stay frozen and only the open one is re-queried.
+
+    ``query`` must take a ``%(since)s`` parameter and only aggregate rows with
+    ``block_timestamp >= %(since)s``; ``period_column`` holds each row's date. The latest period
+    present is always treated as open, so rows landing just after a month rolls over are still
+    picked up. ``prepare`` is applied to every freshly fetched part. The frame and the start of
+    its open period are saved under ``name`` after each refresh, so a restart only re-queries
+    that period.
+    """
+
+    def __init__(self, query, name, period_column, initial_since=EPOCH, freq="M", prepare=None, refresh_interval=600):
+        self._query = query
+        self._name = name
+        self._path = state_path(name, "frame")
+        self._period_column = period_column
+        self._initial_since = initial_since
+        self._freq = freq
+        self._prepare = prepare or (lambda df: df)
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self._frame = None
+        self._open_start = None
+        self._checked_at = None
+
+    def _load(self):
+        saved = load_state(self._path, self._query)
+        if saved is None:
+            return
+        frame, state = saved
+        if state["initial_since"] == self._initial_since.isoformat() and state["freq"] == self._freq:
+            self._frame = frame
+            self._open_start = pd.Timestamp(state["open_start"])
+            report_size(self._name, self._frame)
+
+    def _save(self):
+        state = {
+            "initial_since": self._initial_since.isoformat(),
+            "freq": self._freq,
+            "open_start": self._open_start.isoformat(),
+        }
+        save_state(self._path, self._frame, state, self._query)
+
+    def _fetch(self, since):
+        return self._prepare(run_query(self._query, {"since": since}, cache=False))
+
+    def _advance(self):
+        if self._open_start is None:
+            self._frame = self._fetch(self._initial_since)
+        else:
+            closed = self._frame[self._frame[self._period_column] < self._open_start]
+            self._frame = _concat_keeping_categories(closed, self._fetch(self._open_start.to_pydatetime()))
+        if not self._frame.empty:
+            latest = pd.Timestamp(self._frame[self._period_column].max())
+            self._open_start = max(latest.to_period(self._freq).start_time, pd.Timestamp(self._initial_since))
+            self._save()
+        report_size(self._name, self._frame)
+        self._checked_at = time.monotonic()
+
+    def frame(self):
+        """The current result; shared between callers, so treat it as read-only."""
+        with self._lock:
+            if self._checked_at is None or time.monotonic() - self._checked_at >= self._refresh_interval:
+                self._advance()
+            return self._frame
+
+    def rebuild(self):
+        with self._lock:
+            self._reset()
+            self._advance()
+            return self._frame
+
+
+# --- First-Seen Index -------------------------------------------------------------------------------------------
+# A key's first and last active month are month ordinals (months since 1970) packed into one int,
+# which keeps the index at one small int per key instead of a pair of Timestamps.
+MONTH_BITS = 16
+LAST_MONTH_MASK = (1 << MONTH_BITS) - 1
+
+
+def _month_ordinals(values):
+    return pd.to_datetime(values).values.astype("datetime64[M]").astype("int64")
+
+
+def _month_start(ordinal):
+    return pd.Timestamp(np.datetime64(ordinal, "M"))
+
+
+class FirstSeenIndex:
+    """Month each key (e.g. a delegator) was first seen, plus new/returning key counts per month.
+
+    ``query`` must take a ``%(watermark)s`` parameter, only look at rows with
+    ``block_timestamp > %(watermark)s`` and return one row per (``KEY``, ``MONTH``) with that
+    group's ``LAST_BLOCK_TIMESTAMP``. Each key keeps its first and last active month in a dict,
+    so every delta row is classified with a hash lookup and closed months are never recounted.
+    Each update appends the keys it changed to a state log under ``name``, which is replayed on
+    the next start.
+    """
+
+    def __init__(self, query, name, refresh_interval=600):
+        self._query = query
+        self._name = name
+        self._path = state_path(name, "log", suffix="")
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.watermark = EPOCH
+        self._months = {}  # key -> first month << MONTH_BITS | last month
+        self._counts = {}  # month -> [new, returning]
+        self._compact = True  # the next save rewrites the whole log
+
+    def _load(self):
+        parts = load_state_log(self._path, self._query)
+        if parts is None:
+            return
+        keys, state = replay_state_log(parts, "KEY")
+        packed = (keys["FIRST_MONTH"].to_numpy("int64") << MONTH_BITS) | keys["LAST_MONTH"].to_numpy("int64")
+        self.watermark = datetime.fromisoformat(state["watermark"])
+        self._months = dict(zip(keys["KEY"].tolist(), packed.tolist()))
+        self._counts = {month: [new, returning] for month, new, returning in state["counts"]}
+        self._compact = len(parts) >= STATE_LOG_MAX_PARTS
+        report_size(self._name, self._months, self._counts)
+
+    def _save(self, changed):
+        keys = list(self._months if self._compact else changed)
+        packed = np.fromiter((self._months[key] for key in keys), dtype="int64", count=len(keys))
+        frame = pd.DataFrame({
+            "KEY": pd.Series(keys, dtype="object"),
+            "FIRST_MONTH": (packed >> MONTH_BITS).astype("int32"),
+            "LAST_MONTH": (packed & LAST_MONTH_MASK).astype("int32"),
+        })
+        state = {
+            "watermark": self.watermark.isoformat(),
+            "counts": [[month, new, returning] for month, (new, returning) in sorted(self._counts.items())],
+        }
+        parts = append_state(self._path, frame, state, self._query, compact=self._compact)
+        self._compact = parts >= STATE_LOG_MAX_PARTS
+
+    def _advance(self):
+        delta = run_query(self._query, {"watermark": self.watermark}, cache=False)
+        if not delta.empty:
+            delta = delta.sort_values("MONTH", kind="stable")
+            changed = set()
+            for key, month in zip(delta["KEY"].tolist(), _month_ordinals(delta["MONTH"]).tolist()):
+                seen = self._months.get(key)
+                counts = self._counts.setdefault(month, [0, 0])
+                if seen is None:
+                    self._months[key] = month << MONTH_BITS | month
+                    counts[0] += 1
+                elif seen & LAST_MONTH_MASK < month:
+                    self._months[key] = seen & ~LAST_MONTH_MASK | month
+                    counts[1] += 1
+                else:
+                    continue
+                changed.add(key)
+            self.watermark = pd.Timestamp(delta["LAST_BLOCK_TIMESTAMP"].max()).to_pydatetime()
+            self._save(changed)
+            report_size(self._name, self._months, self._counts)
+        self._checked_at = time.monotonic()
+
+    def _refresh(self):
+        if self._checked_at is None or time.monotonic() - self._checked_at >= self._refresh_interval:
+            self._advance()
+
+    def _monthly_counts(self):
+        months = sorted(self._counts)
+        return pd.DataFrame({
+            "Month": np.array(months, dtype="datetime64[M]").astype("datetime64[ns]"),
+            "New": np.array([self._counts[month][0] for month in months], dtype="int64"),
+            "Returning": np.array([self._counts[month][1] for month in months], dtype="int64"),
+        })
+
+    def first_month(self, key):
+        with self._lock:
+            self._refresh()
+            seen = self._months.get(key)
+            return _month_start(seen >> MONTH_BITS) if seen is not None else None
+
+    def monthly_counts(self):
+        """One row per month with the number of ``New`` and ``Returning`` keys seen in it."""
+        with self._lock:
+            self._refresh()
+            return self._monthly_counts()
+
+    def rebuild(self):
+        with self._lock:
+            self._reset()
+            self._advance()
+
+
+# --- Event Intervals --------------------------------------------------------------------------------------------
+class EventIntervals:
+    """Running totals plus the average number of days between consecutive events of the same key.
+
+    ``totals_query`` takes ``%(watermark)s`` and returns one row summing the new rows, with their
+    max as ``LAST_BLOCK_TIMESTAMP``; every other column is accumulated. ``events_query`` takes
+    ``%(watermark)s`` and ``%(until)s`` and returns one row per (``KEY``, ``DAY``) with the number
+    of ``EVENTS`` that day, ordered by ``DAY``. Day gaps telescope, so only each key's last event
+    day is kept and a refresh folds in the new rows without re-sorting history. Gaps are counted
+    between calendar dates, like Snowflake's ``DATEDIFF(day, ...)``, and same-day events count
+    as zero-day gaps. Each update appends the keys it touched to a state log under ``name``,
+    which is replayed on the next start.
+    """
+
+    def __init__(self, totals_query, events_query, name, refresh_interval=600):
+        self._totals_query = totals_query
+        self._events_query = events_query
+        self._queries = f"{totals_query}\n{events_query}"
+        self._name = name
+        self._path = state_path(name, "log", suffix="")
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.watermark = EPOCH
+        self.totals = {}
+        self.interval_days = 0
+        self.interval_count = 0
+        self._last_day = {}  # key -> day number of its latest event
+        self._checked_at = None
+        self._compact = True  # the next save rewrites the whole log
+
+    def _load(self):
+        parts = load_state_log(self._path, self._queries)
+        if parts is None:
+            return
+        last_days, state = replay_state_log(parts, "KEY")
+        self.watermark = datetime.fromisoformat(state["watermark"])
+        self.totals = state["totals"]
+        self.interval_days = state["interval_days"]
+        self.interval_count = state["interval_count"]
+        self._last_day = dict(zip(last_days["KEY"].tolist(), last_days["LAST_DAY"].tolist()))
+        self._compact = len(parts) >= STATE_LOG_MAX_PARTS
+        report_size(self._name, self._last_day)
+
+    def _save(self, changed):
+        state = {
+            "watermark": self.watermark.isoformat(),
+            "totals": {
+                column: int(value) if isinstance(value, numbers.Integral) else float(value)
+                for column, value in self.totals.items()
+            },
+            "interval_days": int(self.interval_days),
+            "interval_count": int(self.interval_count),
+        }
+        keys = list(self._last_day if self._compact else changed)
+        last_days = pd.DataFrame({
+            "KEY": pd.Series(keys, dtype="object"),
+            "LAST_DAY": pd.Series([self._last_day[key] for key in keys], dtype="int64"),
+        })
+        parts = append_state(self._path, last_days, state, self._queries, compact=self._compact)
+        self._compact = parts >= STATE_LOG_MAX_PARTS
+
+    def _advance(self):
+        totals = run_query(self._totals_query, {"watermark": self.watermark}, cache=False).iloc[0]
+        if pd.notna(totals["LAST_BLOCK_TIMESTAMP"]):
+            until = pd.Timestamp(totals["LAST_BLOCK_TIMESTAMP"]).to_pydatetime()
+            params = {"watermark": self.watermark, "until": until}
+            changed = set()
+            for batch in iter_query_batches(self._events_query, params):
+                days = pd.to_datetime(batch["DAY"]).values.astype("datetime64[D]").astype("int64")
+                for key, day, events in zip(batch["KEY"].tolist(), days.tolist(), batch["EVENTS"].tolist()):
+                    last = self._last_day.get(key)
+                    if last is None:
+                        self.interval_count += events - 1
+                    else:
+                        self.interval_days += day - last
+                        self.interval_count += events
+                    self._last_day[key] = day
+                    changed.add(key)
+            for column, value in totals.drop("LAST_BLOCK_TIMESTAMP").items():
+                self.totals[column] = self.totals.get(column, 0) + (0 if pd.isna(value) else value)
+            self.watermark = until
+            self._save(changed)
+            report_size(self._name, self._last_day)
+        self._checked_at = time.monotonic()
+
+    def snapshot(self):
+        """``(key count, accumulated totals, average days between events or None)``."""
+        with self._lock:
+            if self._checked_at is None or time.monotonic() - self._checked_at >= self._refresh_interval:
+                self._advance()
+            average = self.interval_days / self.interval_count if self.interval_count else None
+            return len(self._last_day), dict(self.totals), average
+
+    def rebuild(self):
+        with self._lock:
+            self._reset()
+            self._advance()
@@ -0,0 +1,194 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# --- Structured Timing Logs -------------------------------------------------------------------------------------
+# Every finished span is logged as one JSON line on the "axelar.timings" logger.
+# AXELAR_TIMING_LOGS=1 attaches a stderr handler so they show up next to Streamlit's own logs.
+logger = logging.getLogger("axelar.timings")
+if os.environ.get("AXELAR_TIMING_LOGS") and not logger.handlers:
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.INFO)
+
+# --- Span Records -----------------------------------------------------------------------------------------------
+# Process-wide ring buffer of the most recent spans, plus a per-thread stack of open ones so
+# queries and connection waits are attributed to the loader that triggered them.
+_recent = deque(maxlen=5000)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def _open_spans():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def record(entry):
+    with _lock:
+        _recent.append(entry)
+    logger.info(json.dumps(entry, default=str))
+
+
+def recent_spans():
+    with _lock:
+        return list(_recent)
+
+
+def clear_spans():
+    with _lock:
+        _recent.clear()
+
+
+@contextmanager
+def span(name, kind="loader"):
+    """Time a block and collect what it fetched; ``kind`` is "loader" or "http"."""
+    entry = {
+        "name": name,
+        "kind": kind,
+        "session_id": _session_id(),
+        "started": time.time(),
+        "wall_ms": None,
+        "rows": 0,
+        "bytes": 0,
+        "queries": 0,
+        "conn_wait_ms": 0.0,
+        "cache": None,
+        "error": None,
+    }
+    stack = _open_spans()
+    stack.append(entry)
+    started = time.perf_counter()
+    try:
+        yield entry
+    except Exception as exc:
+        entry["error"] = type(exc).__name__
+        raise
+    finally:
+        stack.pop()
+        entry["wall_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        if kind == "loader":
+            if entry["queries"]:
+                entry["cache"] = "miss"
+            elif entry["cache"] is None:
+                entry["cache"] = "hit"
+        record(entry)
+
+
+def record_query(df):
+    """Attribute a fetched result to every open span on this thread.
+
+    Bytes are the frame's array sizes (``nbytes``; text columns count their pointers), which costs
+    nothing per row. The loader measures its final result exactly once in ``normalize_result``.
+    """
+    rows = len(df)
+    size = int(df.memory_usage(index=False).sum())
+    for entry in _open_spans():
+        entry["queries"] += 1
+        entry["rows"] += rows
+        entry["bytes"] += size
+
+
+def record_connection_wait(seconds):
+    for entry in _open_spans():
+        entry["conn_wait_ms"] += seconds * 1000
+
+
+def record_cache_source(source):
+    """Note that open spans were served from a cache layer below memory, e.g. "disk"."""
+    for entry in _open_spans():
+        if entry["cache"] is None:
+            entry["cache"] = source
+
+
+def record_cache_miss():
+    """Mark open spans as misses for work that is not a warehouse query (e.g. a blocking HTTP fetch)."""
+    for entry in _open_spans():
+        entry["cache"] = "miss"
+
+
+def instrumented(loader):
+    """Wrap ``loader`` in a span; a call that runs no query is reported as a cache hit."""
+    name = getattr(loader, "__name__", repr(loader))
+
+    @functools.wraps(loader)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return loader(*args, **kwargs)
+
+    return wrapper
+
+
+# --- Sidebar Diagnostics Panel ----------------------------------------------------------------------------------
+class DiagnosticsPanel:
+    """Optional sidebar table of the spans recorded while rendering the current page.
+
+    Create it next to the sidebar footer and call ``render()`` once the page has loaded.
+    """
+
+    def __init__(self):
+        self.enabled = st.sidebar.toggle("⏱ Query diagnostics", key="show_diagnostics")
+        self._placeholder = st.sidebar.empty() if self.enabled else None
+        self._since = time.time()
+        self._session_id = _session_id()
+
+    def render(self):
+        if not self.enabled:
+            return
+        spans = [
+            s for s in recent_spans()
+            if s["started"] >= self._since and s["session_id"] in (self._session_id, None)
+        ]
+        with self._placeholder.container():
+            if not spans:
+                st.caption("No loader calls recorded on this run.")
+                return
+            df = pd.DataFrame(spans)[
+                ["name", "kind", "wall_ms", "cache", "rows", "bytes", "conn_wait_ms", "error"]
+            ].sort_values("wall_ms", ascending=False)
+            st.caption(f"{len(spans)} calls, {df['wall_ms'].max():,.0f} ms slowest")
+            st.dataframe(df, hide_index=True, use_container_width=True)
+
+            from utils.prewarm import get_prewarmer
+            from utils.singleflight import get_single_flight
+
+            flights = get_single_flight().stats()
+            st.caption(
+                f"{flights['executions']:,} query executions, "
+                f"{flights['coalesced']:,} duplicates avoided by coalescing"
+            )
+
+            st.caption("Dataset freshness (UTC)")
+            st.dataframe(get_prewarmer().status(), hide_index=True, use_container_width=True)
+
+            from utils.cache import get_memory_cache
+            from utils.frames import dataset_sizes
+
+            memory_cache = get_memory_cache()
+            stats = memory_cache.stats()
+            st.caption(
+                f"Memory cache: {stats['bytes'] / 2**20:,.1f} of {stats['max_bytes'] / 2**20:,.0f} MB "
+                f"({stats['pinned_bytes'] / 2**20:,.1f} MB pinned) in {stats['entries']:,} entries; "
+                f"{stats['hits']:,} hits, {stats['misses']:,} misses, {stats['evictions']:,} evictions, "
+                f"{stats['expirations']:,} expirations, {stats['oversized']:,} too large to cache. "
+                f"Incremental state outside the budget: {stats['resident_bytes'] / 2**20:,.1f} MB"
+            )
+            datasets = memory_cache.dataset_stats().merge(
+                dataset_sizes()[["dataset", "saved_pct"]], on="dataset", how="left"
+            )
+            st.dataframe(datasets, hide_index=True, use_container_width=True)
@@ -0,0 +1,106 @@
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from utils.cache import get_disk_cache
+
+logger = logging.getLogger(__name__)
+
+# --- Pre-warm Settings ------------------------------------------------------------------------------------------
+PREWARM_ENABLED = os.environ.get("AXELAR_PREWARM", "1") != "0"
+REFRESH_AHEAD = 0.1       # re-run a query once 90% of its TTL has elapsed
+POLL_SECONDS = 15
+IDLE_DROP_SECONDS = 86_400  # stop refreshing datasets nobody has asked for in a day
+
+
+class Prewarmer:
+    """Background scheduler that re-executes cached loader queries shortly before they expire.
+
+    Every query served through a cached loader is tracked with its TTL. A daemon thread re-runs
+    due queries one at a time and atomically replaces their disk cache entry, so the next
+    in-memory expiry is answered from a fresh file instead of the warehouse.
+    """
+
+    def __init__(self, disk_cache):
+        self._disk_cache = disk_cache
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cache-prewarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def track(self, key, dataset, backend, query, params, ttl, refreshed_at):
+        from utils.backends import get_backend
+
+        # Resolve the backend on the caller's (script) thread; the refresh thread has no
+        # Streamlit context to look cached resources up with.
+        source = get_backend(backend)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    "dataset": dataset,
+                    "backend": source,
+                    "query": query,
+                    "params": params,
+                    "ttl": ttl,
+                    "refreshed_at": refreshed_at,
+                    "error": None,
+                }
+            entry["refreshed_at"] = max(entry["refreshed_at"], refreshed_at)
+            entry["last_used"] = now
+
+    def _due(self):
+        now = time.time()
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if now - e["last_used"] > max(IDLE_DROP_SECONDS, 3 * e["ttl"])]:
+                del self._entries[key]
+            return [
+                (key, dict(entry)) for key, entry in self._entries.items()
+                if now >= entry["refreshed_at"] + entry["ttl"] * (1 - REFRESH_AHEAD)
+            ]
+
+    def _refresh(self, key, entry):
+        try:
+            df = entry["backend"].query(entry["query"], entry["params"])
+            self._disk_cache.put(key, df, entry["ttl"])
+            refreshed_at, error = time.time(), None
+        except Exception as exc:
+            logger.exception("pre-warm of %s failed", entry["dataset"])
+            refreshed_at, error = entry["refreshed_at"], type(exc).__name__
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]["refreshed_at"] = refreshed_at
+                self._entries[key]["error"] = error
+
+    def _run(self):
+        while True:
+            time.sleep(POLL_SECONDS)
+            for key, entry in self._due():
+                self._refresh(key, entry)
+
+    def status(self):
+        """Last refresh and next expiry of every tracked dataset."""
+        with self._lock:
+            entries = [dict(e) for e in self._entries.values()]
+        if not entries:
+            return pd.DataFrame(columns=["dataset", "refreshed_at", "expires_at", "error"])
+        df = pd.DataFrame(entries)
+        df["refreshed_at"] = pd.to_datetime(df["refreshed_at"], unit="s")
+        df["expires_at"] = df["refreshed_at"] + pd.to_timedelta(df["ttl"], unit="s")
+        return df[["dataset", "refreshed_at", "expires_at", "error"]].sort_values("dataset")
+
+
+@st.cache_resource
+def get_prewarmer():
+    prewarmer = Prewarmer(get_disk_cache())
+    return prewarmer.start() if PREWARM_ENABLED else prewarmer
@@ -0,0 +1,195 @@
+import logging
+import os
+import re
+import threading
+import time
+
+import streamlit as st
+
+from utils.db import iter_snowflake_batches
+
+logger = logging.getLogger(__name__)
+
+# --- Replica Settings -------------------------------------------------------------------------------------------
+REPLICA_PATH = os.environ.get("AXELAR_REPLICA_PATH", "replica/axelar.duckdb")
+SYNC_INTERVAL = int(os.environ.get("AXELAR_REPLICA_SYNC_SECONDS", "900"))  # 0 disables background sync
+BATCH_ROWS = 100_000
+
+# Mirrored tables and the column their incremental sync is keyed on. Tables without a watermark
+# are small dimension tables that are replaced wholesale on every sync.
+REPLICA_TABLES = {
+    "fact_staking": "block_timestamp",
+    "fact_staking_rewards": "block_timestamp",
+    "fact_validator_commission": "block_timestamp",
+    "fact_validators": None,
+}
+
+# ART indexes for per-wallet lookups (the delegator drill-down); DuckDB uses them for equality filters.
+REPLICA_INDEXES = {
+    "fact_staking": ("delegator_address",),
+    "fact_staking_rewards": ("delegator_address",),
+}
+# DuckDB only scans an index for up to 2048 matches by default; heavy wallets have far more rows
+# and would fall back to a full table scan.
+INDEX_SCAN_MAX_ROWS = 100_000
+
+
+# --- Snowflake -> DuckDB Dialect --------------------------------------------------------------------------------
+_DATEDIFF = re.compile(r"\bDATEDIFF\(\s*(\w+)\s*,", re.IGNORECASE)
+
+
+def to_duckdb_sql(query, params=None):
+    """Rewrite the few Snowflake-only constructs used by the dashboard's SQL into DuckDB syntax.
+
+    The Snowflake connector binds pyformat parameters on the client with ``query % params``, so
+    with parameters a literal ``%`` must be written ``%%``. Placeholders are substituted the same
+    way here, so a query that would fail to bind on Snowflake fails on the replica too.
+    """
+    if params:
+        query = query % {name: f"${name}" for name in params}
+    return _DATEDIFF.sub(r"date_diff('\1',", query)
+
+
+def _snowflake_column_case(df):
+    # Snowflake upper-cases unquoted identifiers while quoted aliases like "Date" keep their case.
+    df.columns = [c.upper() if c == c.lower() else c for c in df.columns]
+    return df
+
+
+# --- Replica Engine ---------------------------------------------------------------------------------------------
+class Replica:
+    """Local DuckDB mirror of axelar.gov, queried with the same SQL the pages send to Snowflake.
+
+    The database is attached as ``axelar`` with a ``gov`` schema, so fully-qualified names such as
+    ``axelar.gov.fact_staking`` resolve unchanged.
+    """
+
+    def __init__(self, path=REPLICA_PATH):
+        import duckdb
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._con = duckdb.connect()
+        self._con.execute(f"ATTACH '{path}' AS axelar")
+        self._con.execute("CREATE SCHEMA IF NOT EXISTS axelar.gov")
+        self._con.execute(f"SET GLOBAL index_scan_max_count = {INDEX_SCAN_MAX_ROWS}")
+        self._sync_lock = threading.Lock()
+        self.last_synced = None
+
+    def cursor(self):
+        return self._con.cursor()
+
+    def query(self, query, params=None):
+        cursor = self.cursor()
+        try:
+            return _snowflake_column_case(cursor.execute(to_duckdb_sql(query, params), params).df())
+        finally:
+            cursor.close()
+
+    def iter_batches(self, query, params=None, rows=BATCH_ROWS):
+        cursor = self.cursor()
+        try:
+            reader = cursor.execute(to_duckdb_sql(query, params), params).fetch_record_batch(rows)
+            for batch in reader:
+                yield _snowflake_column_case(batch.to_pandas())
+        finally:
+            cursor.close()
+
+    def has_table(self, table):
+        cursor = self.cursor()
+        try:
+            return cursor.execute(
+                """
+                SELECT count(*) FROM duckdb_tables()
+                WHERE database_name = 'axelar' AND schema_name = 'gov' AND table_name = ?
+                """,
+                [table],
+            ).fetchone()[0] > 0
+        finally:
+            cursor.close()
+
+    def is_populated(self):
+        return all(self.has_table(table) for table in REPLICA_TABLES)
+
+    def _sync_table(self, table, watermark_column, source):
+        target = f"axelar.gov.{table}"
+        exists = self.has_table(table)
+        cursor = self.cursor()
+        try:
+            watermark = None
+            if watermark_column and exists:
+                watermark = cursor.execute(f"SELECT MAX({watermark_column}) FROM {target}").fetchone()[0]
+            if watermark is None:
+                query, params = f"SELECT * FROM {target}", None
+            else:
+                query = f"SELECT * FROM {target} WHERE {watermark_column} > %(watermark)s"
+                params = {"watermark": watermark}
+
+            # Readers keep seeing the previous snapshot until the whole delta is committed.
+            replace = watermark_column is None or not exists
+            rows = 0
+            cursor.execute("BEGIN TRANSACTION")
+            try:
+                for batch in source(query, params):
+                    cursor.register("sync_batch", batch)
+                    if replace:
+                        cursor.execute(f"CREATE OR REPLACE TABLE {target} AS SELECT * FROM sync_batch")
+                        replace = False
+                    else:
+                        cursor.execute(f"INSERT INTO {target} BY NAME SELECT * FROM sync_batch")
+                    cursor.unregister("sync_batch")
+                    rows += len(batch)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            return rows
+        finally:
+            cursor.close()
+
+    def ensure_indexes(self):
+        """Create any missing ``REPLICA_INDEXES``; replacing a table drops its indexes."""
+        cursor = self.cursor()
+        try:
+            for table, columns in REPLICA_INDEXES.items():
+                if not self.has_table(table):
+                    continue
+                for column in columns:
+                    cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column}_idx ON axelar.gov.{table} ({column})")
+        finally:
+            cursor.close()
+
+    def sync(self, source=iter_snowflake_batches):
+        """Pull rows newer than each table's watermark from ``source`` (Snowflake by default)."""
+        with self._sync_lock:
+            synced = {}
+            for table, watermark_column in REPLICA_TABLES.items():
+                synced[table] = self._sync_table(table, watermark_column, source)
+            self.ensure_indexes()
+            self.last_synced = time.time()
+            logger.info("replica sync: %s", synced)
+            return synced
+
+
+def _sync_forever(replica, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            replica.sync()
+        except Exception:
+            logger.exception("replica sync failed, serving the previous snapshot")
+
+
+@st.cache_resource
+def get_replica():
+    replica = Replica()
+    if not replica.is_populated():
+        replica.sync()
+    if SYNC_INTERVAL > 0:
+        threading.Thread(target=_sync_forever, args=(replica, SYNC_INTERVAL), name="replica-sync", daemon=True).start()
+    return replica
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    Replica().sync()
@@ -0,0 +1,69 @@
+import threading
+
+import pandas as pd
+import streamlit as st
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution.
+
+    The first caller runs ``fn``; everyone arriving while it is in flight waits and receives the
+    same result or exception. When a DataFrame result is shared, the original is kept untouched and
+    every caller, the first one included, gets its own copy, so no caller can mutate a frame another
+    one is still copying.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Return ``(result, shared)`` where ``shared`` is True if another caller did the work."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as exc:
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]  # no new waiters can join once the call is unlisted
+                    self.executions += 1
+                    shared = call.waiters > 0
+                call.done.set()
+        else:
+            call.done.wait()
+            shared = True
+
+        if call.error is not None:
+            raise call.error
+        if shared and isinstance(call.result, pd.DataFrame):
+            return call.result.copy(), not leader
+        return call.result, not leader
+
+    def stats(self):
+        with self._lock:
+            return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight()
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from utils.timeseries import ewma_volatility, rolling_std, rolling_zscore
+
+# --- Daily Staking Cube -----------------------------------------------------------------------------------------
+# One row per (day, action) over successful fact_staking rows, a few rows per day however much
+# activity there is. Every Staking page time series is a regrouping of it, so a single warehouse
+# scan feeds all of them. Transaction counts add up exactly across days because a tx has one
+# timestamp. Per-delegator views (New vs Returning) come from utils.incremental.FirstSeenIndex.
+# The cube is kept by utils.incremental.IncrementalFrame, which only re-queries the open month.
+CUBE_QUERY = """
+SELECT
+    block_timestamp::date AS "Day",
+    action AS "Action",
+    SUM(amount) / 1e6 AS "Volume (AXL)",
+    COUNT(DISTINCT tx_id) AS "Transactions"
+FROM axelar.gov.fact_staking
+WHERE tx_succeeded = TRUE
+  AND block_timestamp >= %(since)s
+GROUP BY 1, 2
+"""
+
+CHART_START = pd.Timestamp("2022-09-01")
+CHART_ACTIONS = ["delegate", "undelegate", "redelegate"]
+SPIKE_THRESHOLD = 2.0
+
+
+def prepare_cube(cube):
+    return cube.assign(Day=pd.to_datetime(cube["Day"]), Action=cube["Action"].astype("category"))
+
+
+def month_start(days):
+    return pd.Series(days.values.astype("datetime64[M]").astype("datetime64[ns]"), index=days.index)
+
+
+def week_start(days):
+    # Monday-based weeks, matching Snowflake's default DATE_TRUNC('week', ...)
+    return days - pd.to_timedelta(days.dt.dayofweek, unit="D")
+
+
+# --- Derived Views ----------------------------------------------------------------------------------------------
+def action_volume_by_month(cube):
+    rows = cube[cube["Action"].isin(CHART_ACTIONS) & (cube["Day"] >= CHART_START)]
+    monthly = (
+        rows.groupby([month_start(rows["Day"]).rename("Date"), rows["Action"]], observed=True)
+        [["Volume (AXL)", "Transactions"]].sum()
+        .reset_index()
+        .sort_values("Date", kind="stable")
+    )
+    monthly["Action"] = monthly["Action"].astype(str)
+    monthly["Volume (AXL)"] = monthly["Volume (AXL)"].round()
+    return monthly.reset_index(drop=True)
+
+
+def stakers_by_month(counts):
+    """Long-form New/Returning staker counts from a ``FirstSeenIndex.monthly_counts()`` frame."""
+    counts = counts[counts["Month"] >= CHART_START].rename(
+        columns={"Month": "Date", "New": "New Staker", "Returning": "Returning Staker"}
+    )
+    stakers = counts.melt(id_vars="Date", var_name="Staker Type", value_name="Staker Count")
+    return (
+        stakers[stakers["Staker Count"] > 0]
+        .sort_values(["Date", "Staker Type"], kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def weekly_delegations(cube):
+    """Weekly delegated volume, unrounded so rolling statistics see the exact sums."""
+    delegates = cube[(cube["Action"] == "delegate") & (cube["Day"] >= CHART_START)]
+    return (
+        delegates.groupby(week_start(delegates["Day"]).rename("Date"))["Volume (AXL)"].sum()
+        .reset_index(name="Total Staked Amount (AXL)")
+        .sort_values("Date")
+        .reset_index(drop=True)
+    )
+
+
+def weekly_volatility(weekly, window, spike_threshold=SPIKE_THRESHOLD):
+    """Rolling and EWMA volatility plus z-score spikes for a ``weekly_delegations`` frame."""
+    amounts = weekly["Total Staked Amount (AXL)"].to_numpy()
+    zscores = rolling_zscore(amounts, window)
+    return weekly.assign(**{
+        "Total Staked Amount (AXL)": amounts.round(),
+        "Weekly Volatility": rolling_std(amounts, window),
+        "EWMA Volatility": ewma_volatility(amounts, window),
+        "Z-Score": zscores,
+        "Spike": np.abs(np.nan_to_num(zscores)) >= spike_threshold,
+    })
+
+
+def action_totals(cube):
+    totals = (
+        cube.groupby("Action", observed=True)
+        .agg(**{"Action Count": ("Transactions", "sum"), "Action Amount (AXL)": ("Volume (AXL)", "sum")})
+        .reset_index()
+        .rename(columns={"Action": "ACTION"})
+        .sort_values("Action Count", ascending=False)
+    )
+    totals["ACTION"] = totals["ACTION"].astype(str)
+    totals["Action Amount (AXL)"] = totals["Action Amount (AXL)"].round()
+    return totals.reset_index(drop=True)
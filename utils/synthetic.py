@@ -0,0 +1,116 @@
+import argparse
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from utils.replica import REPLICA_TABLES, Replica
+
+# --- Synthetic Settings -----------------------------------------------------------------------------------------
+SYNTHETIC_ROWS = int(os.environ.get("AXELAR_SYNTHETIC_ROWS", "1000000"))
+SYNTHETIC_PATH = os.environ.get("AXELAR_SYNTHETIC_PATH", ":memory:")
+SYNTHETIC_SEED = int(os.environ.get("AXELAR_SYNTHETIC_SEED", "42"))
+HISTORY_START = datetime(2022, 2, 10)
+
+
+def generate(replica, staking_rows=SYNTHETIC_ROWS, seed=SYNTHETIC_SEED, end=None):
+    """Fill ``replica`` with synthetic axelar.gov fact tables shaped like the real ones.
+
+    Everything is generated inside DuckDB from ``range()`` and seeded hashes, so output is
+    deterministic for a given seed and 100M-row tables never pass through Python. Delegator and
+    validator activity is skewed so a few heavy wallets and large validators dominate, as on chain.
+    """
+    end = end or datetime.now().replace(microsecond=0)
+    span_seconds = int((end - HISTORY_START).total_seconds())
+    validators = 150
+    delegators = max(1_000, staking_rows // 20)
+    reward_rows = staking_rows * 2
+    commission_rows = max(1_000, staking_rows // 50)
+
+    cursor = replica.cursor()
+    try:
+        cursor.execute(f"""
+            CREATE OR REPLACE TEMP MACRO u(i, salt) AS (hash(i, salt, {seed}) % 1000003) / 1000003.0;
+            CREATE OR REPLACE TEMP MACRO delegator(k) AS 'axelar1' || substr(md5('d' || k::VARCHAR), 1, 38);
+            CREATE OR REPLACE TEMP MACRO validator(k) AS 'axelarvaloper1' || substr(md5('v' || k::VARCHAR), 1, 38);
+            CREATE OR REPLACE TEMP MACRO ts(i, n) AS
+                TIMESTAMP '{HISTORY_START:%Y-%m-%d %H:%M:%S}' + to_seconds((i * {span_seconds} // n)::BIGINT);
+        """)
+
+        cursor.execute(f"""
+            CREATE OR REPLACE TABLE axelar.gov.fact_validators AS
+            SELECT
+                validator(k) AS address,
+                'Validator ' || lpad(k::VARCHAR, 3, '0') AS label,
+                round(0.02 + u(k, 'rate') * 0.18, 2) AS rate,
+                round(1e12 * pow(u(k, 'shares'), 3), 1) AS delegator_shares
+            FROM range({validators}) t(k)
+        """)
+
+        cursor.execute(f"""
+            CREATE OR REPLACE TABLE axelar.gov.fact_staking AS
+            WITH base AS (
+                SELECT
+                    i,
+                    u(i, 'action') AS action_u,
+                    floor(pow(u(i, 'delegator'), 2) * {delegators})::BIGINT AS d,
+                    floor(pow(u(i, 'validator'), 1.5) * {validators})::BIGINT AS v,
+                    floor(u(i, 'source') * {validators})::BIGINT AS src
+                FROM range({staking_rows}) t(i)
+            )
+            SELECT
+                ts(i, {staking_rows}) AS block_timestamp,
+                md5('stake' || i::VARCHAR) AS tx_id,
+                u(i, 'ok') < 0.97 AS tx_succeeded,
+                CASE WHEN action_u < 0.70 THEN 'delegate' WHEN action_u < 0.85 THEN 'undelegate' ELSE 'redelegate' END AS action,
+                floor(pow(10, 7 + u(i, 'amount') * 5))::BIGINT AS amount,
+                delegator(d) AS delegator_address,
+                validator(v) AS validator_address,
+                CASE WHEN action_u >= 0.85 THEN validator(src) END AS redelegate_source_validator_address,
+                CASE WHEN action_u >= 0.70 AND action_u < 0.85 THEN ts(i, {staking_rows}) + INTERVAL 7 DAY END AS completion_time
+            FROM base
+        """)
+
+        cursor.execute(f"""
+            CREATE OR REPLACE TABLE axelar.gov.fact_staking_rewards AS
+            SELECT
+                ts(i, {reward_rows}) AS block_timestamp,
+                md5('reward' || i::VARCHAR) AS tx_id,
+                u(i, 'ok') < 0.98 AS tx_succeeded,
+                delegator(floor(pow(u(i, 'delegator'), 2) * {delegators})::BIGINT) AS delegator_address,
+                validator(floor(pow(u(i, 'validator'), 1.5) * {validators})::BIGINT) AS validator_address,
+                floor(pow(10, 4 + u(i, 'amount') * 4))::BIGINT AS amount
+            FROM range({reward_rows}) t(i)
+        """)
+
+        cursor.execute(f"""
+            CREATE OR REPLACE TABLE axelar.gov.fact_validator_commission AS
+            SELECT
+                ts(i, {commission_rows}) AS block_timestamp,
+                md5('commission' || i::VARCHAR) AS tx_id,
+                u(i, 'ok') < 0.99 AS tx_succeeded,
+                validator(floor(u(i, 'validator') * {validators})::BIGINT) AS validator_address_operator,
+                floor(pow(10, 6 + u(i, 'amount') * 4))::BIGINT AS amount
+            FROM range({commission_rows}) t(i)
+        """)
+    finally:
+        cursor.close()
+    replica.ensure_indexes()
+
+
+@st.cache_resource
+def get_synthetic_replica():
+    replica = Replica(SYNTHETIC_PATH)
+    if not replica.is_populated():
+        generate(replica)
+    return replica
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic axelar.gov tables into a DuckDB file.")
+    parser.add_argument("--rows", type=int, default=SYNTHETIC_ROWS, help="fact_staking rows")
+    parser.add_argument("--seed", type=int, default=SYNTHETIC_SEED)
+    parser.add_argument("--path", default="replica/synthetic.duckdb")
+    args = parser.parse_args()
+    generate(Replica(args.path), staking_rows=args.rows, seed=args.seed)
+    print(f"wrote {', '.join(REPLICA_TABLES)} to {args.path}")
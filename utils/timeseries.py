@@ -0,0 +1,44 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# --- Rolling Statistics -----------------------------------------------------------------------------------------
+# Plain NumPy over short weekly series, so changing a window never needs a new query.
+def _trailing_windows(values, window):
+    padded = np.concatenate([np.full(window - 1, np.nan), np.asarray(values, dtype="float64")])
+    return sliding_window_view(padded, window)
+
+
+def _window_stats(windows, min_periods):
+    counts = np.sum(~np.isnan(windows), axis=1)
+    safe_counts = np.maximum(counts, 1)
+    mean = np.nansum(windows, axis=1) / safe_counts
+    squares = np.nansum((windows - mean[:, None]) ** 2, axis=1)
+    std = np.sqrt(squares / np.maximum(counts - 1, 1))
+    valid = counts >= min_periods
+    return np.where(valid, mean, np.nan), np.where(valid, std, np.nan)
+
+
+def rolling_std(values, window, min_periods=2):
+    """Sample standard deviation over each value and the ``window - 1`` before it."""
+    return _window_stats(_trailing_windows(values, window), min_periods)[1]
+
+
+def ewma_volatility(values, span):
+    """Exponentially weighted standard deviation (``alpha = 2 / (span + 1)``, adjusted weights)."""
+    x = np.asarray(values, dtype="float64")
+    lags = np.arange(len(x))[:, None] - np.arange(len(x))[None, :]
+    weights = np.where(lags >= 0, (1 - 2 / (span + 1)) ** np.maximum(lags, 0), 0.0)
+    weights /= weights.sum(axis=1, keepdims=True)
+    mean = weights @ x
+    variance = np.sum(weights * (x[None, :] - mean[:, None]) ** 2, axis=1)
+    return np.sqrt(variance)
+
+
+def rolling_zscore(values, window, min_periods=2):
+    """How many standard deviations each value sits from the ``window`` values before it."""
+    x = np.asarray(values, dtype="float64")
+    previous = np.concatenate([[np.nan], x[:-1]])
+    mean, std = _window_stats(_trailing_windows(previous, window), min_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (x - mean) / std, np.nan)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# --- Per-Validator Daily Rollups --------------------------------------------------------------------------------
+# One row per (validator, day) with everything the validator detail view charts, built for all
+# validators in a single pass so switching validators is a local slice. Filters mirror the
+# aggregate queries on the Validators page (stake and commission over all rows, rewards over
+# successful claims) so the detail totals line up with them.
+ROLLUP_QUERY = """
+WITH flows AS (
+    SELECT
+        validator_address AS validator,
+        block_timestamp::date AS day,
+        CASE WHEN action = 'undelegate' THEN -amount ELSE amount END / 1e6 AS net_stake,
+        0 AS new_delegators, 0 AS commission, 0 AS rewards
+    FROM axelar.gov.fact_staking
+
+    UNION ALL
+
+    SELECT redelegate_source_validator_address, block_timestamp::date, -amount / 1e6, 0, 0, 0
+    FROM axelar.gov.fact_staking
+    WHERE action = 'redelegate'
+
+    UNION ALL
+
+    SELECT validator_address, MIN(block_timestamp)::date, 0, 1, 0, 0
+    FROM axelar.gov.fact_staking
+    WHERE action = 'delegate'
+    GROUP BY validator_address, delegator_address
+
+    UNION ALL
+
+    SELECT validator_address_operator, block_timestamp::date, 0, 0, amount / 1e6, 0
+    FROM axelar.gov.fact_validator_commission
+
+    UNION ALL
+
+    SELECT validator_address, block_timestamp::date, 0, 0, 0, amount / 1e6
+    FROM axelar.gov.fact_staking_rewards
+    WHERE tx_succeeded = TRUE
+)
+SELECT
+    f.validator AS "Validator Address",
+    COALESCE(v.label, f.validator) AS "Validator Name",
+    f.day AS "Day",
+    SUM(f.net_stake) AS "Net Stake Change (AXL)",
+    SUM(f.new_delegators) AS "New Delegators",
+    SUM(f.commission) AS "Commission Claimed (AXL)",
+    SUM(f.rewards) AS "Rewards Claimed (AXL)"
+FROM flows f
+LEFT JOIN axelar.gov.fact_validators v ON f.validator = v.address
+WHERE f.validator IS NOT NULL
+GROUP BY 1, 2, 3
+"""
+
+ROLLUP_MEASURES = ["Net Stake Change (AXL)", "New Delegators", "Commission Claimed (AXL)", "Rewards Claimed (AXL)"]
+
+
+def prepare_rollups(rollups):
+    rollups = rollups.assign(**{
+        "Day": pd.to_datetime(rollups["Day"]),
+        "Validator Address": rollups["Validator Address"].astype("category"),
+        "Validator Name": rollups["Validator Name"].astype("category"),
+        "New Delegators": rollups["New Delegators"].astype("int64"),
+    })
+    return rollups.sort_values(["Validator Address", "Day"], kind="stable").reset_index(drop=True)
+
+
+def validator_names(rollups):
+    """``{address: name}`` for every validator in the rollups, largest current stake first."""
+    stake = rollups.groupby("Validator Address", observed=True)["Net Stake Change (AXL)"].sum()
+    names = rollups.drop_duplicates("Validator Address").set_index("Validator Address")["Validator Name"]
+    return {address: str(names[address]) for address in stake.sort_values(ascending=False).index}
+
+
+def validator_daily(rollups, address):
+    """One validator's rollups on a continuous daily index, with running stake and delegator counts."""
+    rows = rollups[rollups["Validator Address"] == address]
+    daily = rows.set_index("Day")[ROLLUP_MEASURES]
+    if daily.empty:
+        return daily
+    days = pd.date_range(daily.index.min(), rollups["Day"].max(), freq="D", name="Day")
+    daily = daily.reindex(days, fill_value=0)
+    daily["Staked (AXL)"] = daily["Net Stake Change (AXL)"].cumsum()
+    daily["Unique Delegators"] = daily["New Delegators"].cumsum()
+    return daily.reset_index()
+
+
+# --- Historical Stake Matrix ------------------------------------------------------------------------------------
+def stake_history(rollups):
+    """Stake of every validator on every day as ``(addresses, days, matrix)``.
+
+    Daily net flows are scattered into a validators x days array and summed cumulatively along
+    the day axis, so ``matrix[i, j]`` is validator ``addresses[i]``'s stake at the end of
+    ``days[j]``.
+    """
+    addresses = rollups["Validator Address"].cat.categories
+    first, last = rollups["Day"].min(), rollups["Day"].max()
+    days = pd.date_range(first, last, freq="D").values
+    cells = rollups["Validator Address"].cat.codes.to_numpy(dtype="int64") * len(days) + (rollups["Day"] - first).dt.days.to_numpy()
+    flows = np.bincount(
+        cells, weights=rollups["Net Stake Change (AXL)"].to_numpy(dtype="float64"),
+        minlength=len(addresses) * len(days),
+    ).reshape(len(addresses), len(days))
+    return addresses.to_numpy(), days, np.cumsum(flows, axis=1)
+
+
+def stake_as_of(history, day):
+    """Per-validator stake at the end of ``day``; zero before the history starts."""
+    addresses, days, matrix = history
+    column = np.searchsorted(days, np.datetime64(pd.Timestamp(day)), side="right") - 1
+    stake = matrix[:, column] if column >= 0 else np.zeros(len(addresses))
+    return pd.Series(stake, index=addresses, name="Staked (AXL)")